@@ -1,5 +1,8 @@
 from fastapi import APIRouter, HTTPException, Request
+import asyncio
+
 from app.controllers.llm_controller import LLMController
+from app.core.config import DEFAULT_MODEL
 
 import logging
 
@@ -14,17 +17,20 @@ async def get_models(request: Request):
 
     try:
         controller = LLMController()
-        models = controller.list_available_models()
+        models = await asyncio.to_thread(controller.list_available_models)
+        available = models if isinstance(models, list) else []
 
-        default_model = "llama3.2:3b" if "llama3.2:3b" in models else (
-            models["models"][0] if models else "Models Not Found"
+        default_model = DEFAULT_MODEL if DEFAULT_MODEL in available else (
+            available[0] if available else "Models Not Found"
         )
 
-        logger.info(f"Models retrieved | count={len(models) if models else 0}")
+        logger.info(f"Models retrieved | count={len(available)}")
 
         return {
             "default": default_model,
-            "models": models
+            "models": models,
+            # e.g. {"llama3.2:3b-instruct-q4_K_M": "Q4_K_M"}
+            "quantization": await asyncio.to_thread(controller.list_model_quantization)
         }
 
     except Exception as e:
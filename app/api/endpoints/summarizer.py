@@ -1,14 +1,16 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Request
-import tempfile
+from fastapi.responses import StreamingResponse
 import os
-import json
 import uuid
+from queue import Full
 
-from app.core.config import TEMP_DIR
-from app.core.job_queue import create_job, get_job_result
+import orjson
+
+from app.core.config import DEFAULT_MODEL, TEMP_DIR
+from app.core.job_queue import create_job, get_job_result, job_queue
 from app.services.summarization_service import SummarizationService
 from app.core.security import verify_api_key
-from app.utils.file_utils import save_temp_file
+from app.utils.file_utils import read_upload_file, save_upload_file
 
 import logging
 logger = logging.getLogger("yegi.api")
@@ -16,18 +18,27 @@ logger = logging.getLogger("yegi.api")
 router = APIRouter()
 
 MAX_FILE_SIZE = 15 * 1024 * 1024
+PUBLIC_MAX_FILE_SIZE = 10 * 1024 * 1024
+MAX_BATCH_FILES = 10
+MAX_BATCH_SIZE = 50 * 1024 * 1024
+QUEUE_FULL_DETAIL = "Too many pending jobs, try again later"
 
 # HELPERS
 
-def validate_file(file: UploadFile, file_size: int, api_key_type: str):
+def validate_file(file: UploadFile):
     if not file.filename.endswith(".pdf") or file.content_type != "application/pdf":
         raise HTTPException(400, "The file must be a valid PDF.")
 
-    if file_size > MAX_FILE_SIZE:
-        raise HTTPException(413, "File too large")
 
-    if api_key_type == "public" and file_size > 10 * 1024 * 1024:
-        raise HTTPException(403, "Public API limit exceeded (10MB max)")
+def upload_limits(api_key_type: str) -> dict:
+    if api_key_type == "public":
+        return {
+            "max_size": PUBLIC_MAX_FILE_SIZE,
+            "status_code": 403,
+            "detail": "Public API limit exceeded (10MB max)",
+        }
+
+    return {"max_size": MAX_FILE_SIZE}
 
 
 def validate_params(temperature, top_p, num_predict):
@@ -41,18 +52,20 @@ def validate_params(temperature, top_p, num_predict):
 
 def parse_header_weights(header_weights: str):
     try:
-        data = json.loads(header_weights)
+        data = orjson.loads(header_weights)
 
         if not isinstance(data, dict):
             raise ValueError("Must be a dictionary")
 
+        # Validate and sum in a single pass
+        total = 0
+
         for k, v in data.items():
             if not isinstance(v, (int, float)):
                 raise ValueError(f"{k} must be numeric")
             if v < 0:
                 raise ValueError(f"{k} cannot be negative")
-
-        total = sum(data.values())
+            total += v
 
         if total == 0 and data:
             raise ValueError("At least one weight must be > 0")
@@ -92,7 +105,7 @@ async def summarizer(
     request: Request,
     api_key_type: str = Depends(verify_api_key),
     archivo_pdf: UploadFile = File(...),
-    model: str = Form("llama3.2:3b"),
+    model: str = Form(DEFAULT_MODEL),
     temperature: float = Form(0.1),
     top_p: float = Form(0.7),
     repeat_penalty: float = Form(1.1),
@@ -104,14 +117,12 @@ async def summarizer(
 ):
     request_id = request.state.request_id
 
-    file_content = await archivo_pdf.read()
-    file_size = len(file_content)
-
-    validate_file(archivo_pdf, file_size, api_key_type)
+    validate_file(archivo_pdf)
     validate_params(temperature, top_p, num_predict)
     header_weights_dict = parse_header_weights(header_weights)
 
-    ruta_archivo = save_temp_file(file_content)
+    file_content = await read_upload_file(archivo_pdf, **upload_limits(api_key_type))
+
     options_dict = build_options(
         temperature,
         top_p,
@@ -124,8 +135,8 @@ async def summarizer(
     service = SummarizationService()
 
     try:
-        result = service.summarize(
-            file_path=ruta_archivo,
+        result = await service.summarize(
+            source=file_content,
             model=model,
             options_dict=options_dict,
             language=language,
@@ -138,10 +149,136 @@ async def summarizer(
         logger.error(f"[{request_id}] Summarization failed | error={str(e)}")
         raise HTTPException(500, "Internal server error")
 
+# STREAMING ENDPOINT
+@router.post("/stream")
+async def summarizer_stream(
+    request: Request,
+    api_key_type: str = Depends(verify_api_key),
+    archivo_pdf: UploadFile = File(...),
+    model: str = Form(DEFAULT_MODEL),
+    temperature: float = Form(0.1),
+    top_p: float = Form(0.7),
+    repeat_penalty: float = Form(1.1),
+    repeat_last_n: int = Form(32),
+    num_predict: int = Form(1000),
+    seed: int | None = Form(None),
+    language: str = Form("español"),
+    header_weights: str = Form("{}"),
+):
+    request_id = request.state.request_id
+
+    validate_file(archivo_pdf)
+    validate_params(temperature, top_p, num_predict)
+    header_weights_dict = parse_header_weights(header_weights)
+
+    file_content = await read_upload_file(archivo_pdf, **upload_limits(api_key_type))
+
+    options_dict = build_options(
+        temperature,
+        top_p,
+        repeat_penalty,
+        repeat_last_n,
+        num_predict,
+        seed
+    )
+
+    service = SummarizationService()
+
+    frames = service.summarize_stream(
+        source=file_content,
+        model=model,
+        options_dict=options_dict,
+        language=language,
+        header_weights=header_weights_dict,
+        request_id=request_id
+    )
+
+    # One JSON object per line (NDJSON)
+    return StreamingResponse(
+        (orjson.dumps(frame) + b"\n" async for frame in frames),
+        media_type="application/x-ndjson"
+    )
+
+# BATCH ENDPOINT
+@router.post("/batch")
+async def summarizer_batch(
+    request: Request,
+    api_key_type: str = Depends(verify_api_key),
+    archivos_pdf: list[UploadFile] = File(...),
+    model: str = Form(DEFAULT_MODEL),
+    temperature: float = Form(0.1),
+    top_p: float = Form(0.7),
+    repeat_penalty: float = Form(1.1),
+    repeat_last_n: int = Form(32),
+    num_predict: int = Form(1000),
+    seed: int | None = Form(None),
+    language: str = Form("español"),
+    header_weights: str = Form("{}"),
+):
+    request_id = request.state.request_id
+
+    if len(archivos_pdf) > MAX_BATCH_FILES:
+        raise HTTPException(400, f"Too many files (max {MAX_BATCH_FILES})")
+
+    for archivo_pdf in archivos_pdf:
+        validate_file(archivo_pdf)
+
+    validate_params(temperature, top_p, num_predict)
+    header_weights_dict = parse_header_weights(header_weights)
+
+    options_dict = build_options(
+        temperature,
+        top_p,
+        repeat_penalty,
+        repeat_last_n,
+        num_predict,
+        seed
+    )
+
+    # Workers receive file paths instead of pickled PDF bytes. Batches
+    # are staged on disk (TEMP_DIR), not in the small /dev/shm tmpfs.
+    limits = upload_limits(api_key_type)
+    remaining = MAX_BATCH_SIZE
+    rutas_archivos = []
+
+    try:
+        for archivo_pdf in archivos_pdf:
+            file_limits = limits
+
+            if limits["max_size"] > remaining:
+                file_limits = {
+                    "max_size": remaining,
+                    "detail": f"Batch too large ({MAX_BATCH_SIZE // (1024 * 1024)}MB max in total)",
+                }
+
+            ruta_archivo, size = await save_upload_file(
+                archivo_pdf, **file_limits, directory=TEMP_DIR
+            )
+            rutas_archivos.append(ruta_archivo)
+            remaining -= size
+
+        service = SummarizationService()
+
+        results = await service.summarize_batch(
+            sources=rutas_archivos,
+            model=model,
+            options_dict=options_dict,
+            language=language,
+            header_weights=header_weights_dict,
+            request_id=request_id
+        )
+
     finally:
-        if os.path.exists(ruta_archivo):
-            os.remove(ruta_archivo)
-            logger.info("Temp file removed")
+        for ruta_archivo in rutas_archivos:
+            if os.path.exists(ruta_archivo):
+                os.remove(ruta_archivo)
+
+    return {
+        "results": [
+            {"filename": archivo_pdf.filename, **result}
+            for archivo_pdf, result in zip(archivos_pdf, results)
+        ]
+    }
 
 # Workers
 
@@ -150,7 +287,7 @@ async def summarizer_async(
     request: Request,
     api_key_type: str = Depends(verify_api_key),
     archivo_pdf: UploadFile = File(...),
-    model: str = Form("llama3.2:3b"),
+    model: str = Form(DEFAULT_MODEL),
     temperature: float = Form(0.1),
     top_p: float = Form(0.7),
     repeat_penalty: float = Form(1.1),
@@ -162,14 +299,15 @@ async def summarizer_async(
 ):
     request_id = request.state.request_id
 
-    file_content = await archivo_pdf.read()
-    file_size = len(file_content)
-
-    validate_file(archivo_pdf, file_size, api_key_type)
+    validate_file(archivo_pdf)
     validate_params(temperature, top_p, num_predict)
     header_weights_dict = parse_header_weights(header_weights)
 
-    ruta_archivo = save_temp_file(file_content)
+    # Reject before staging: every queued job holds its PDF in the tmpfs
+    if job_queue.full():
+        raise HTTPException(503, QUEUE_FULL_DETAIL)
+
+    ruta_archivo, _ = await save_upload_file(archivo_pdf, **upload_limits(api_key_type))
     options_dict = build_options(
         temperature,
         top_p,
@@ -179,14 +317,19 @@ async def summarizer_async(
         seed
     )
 
-    job_id = create_job({
-        "file_path": ruta_archivo,
-        "model": model,
-        "options_dict": options_dict,
-        "language": language,
-        "header_weights": header_weights_dict,
-        "request_id": request_id
-    })
+    try:
+        job_id = create_job({
+            "source": ruta_archivo,
+            "model": model,
+            "options_dict": options_dict,
+            "language": language,
+            "header_weights": header_weights_dict,
+            "request_id": request_id
+        })
+    except Full:
+        # Filled up while the upload was being staged
+        os.remove(ruta_archivo)
+        raise HTTPException(503, QUEUE_FULL_DETAIL)
 
     logger.info(f"[{request_id}] Job created | job_id={job_id}")
 
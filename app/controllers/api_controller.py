@@ -1,8 +1,27 @@
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+from typing import AsyncIterator
+
 from .pdf_extractor import PDFExtractor
 from .text_preprocessor import TextPreprocessor
 from .llm_controller import LLMController
 from .generate_json import JSONResponse
 from .error_validator import ErrorValidator
+from app.core.process_pool import get_process_pool, reset_process_pool
+
+def prepare_text(source: str | bytes) -> tuple[str, dict]:
+    """
+    Extracts and cleans the PDF text.
+    Runs in the shared process pool, so it only takes picklable
+    arguments and returns (cleaned_text, warnings).
+    """
+    extracted_text = PDFExtractor(source).extract_text()
+
+    preprocessor = TextPreprocessor(extracted_text)
+    preprocessor.run_pipeline()
+
+    return preprocessor.cleaned_text, preprocessor.warnings
+
 
 class APIController:
     """
@@ -12,19 +31,18 @@ class APIController:
 
     def __init__(
         self,
-        file_path: str,
+        source: str | bytes,
         model: str,
         options: dict,
         language: str = "spanish",
         header_weights: dict | None = None,
     ):
-        self.file_path = file_path
+        self.source = source
         self.model = model
         self.options = options
         self.language = language
         self.header_weights = header_weights or {}
 
-        self.extracted_text = ""
         self.cleaned_text = ""
         self.summary = ""
         self.warnings = []
@@ -35,39 +53,51 @@ class APIController:
     # -----------------------------
 
     def _validate_pdf(self) -> bool:
-        return self.file_path.lower().endswith(".pdf")
+        if not isinstance(self.source, str):
+            return True
+        return self.source.lower().endswith(".pdf")
 
     # -----------------------------
     # Main Process
     # -----------------------------
 
-    def process(self) -> dict:
+    async def _prepare_text(self, validator: ErrorValidator) -> dict | None:
         """
-        Executes the full summarization pipeline.
+        Extracts and cleans the PDF text in a worker process.
+        Returns an error response on failure, None otherwise.
         """
 
-        validator = ErrorValidator()
-
         if not self._validate_pdf():
             return validator.error("Invalid file. Only PDF files are allowed.")
 
-        # 1️ Extract PDF text
         try:
-            extractor = PDFExtractor(self.file_path)
-            self.extracted_text = extractor.extract_text()
+            result = await self._prepare_in_pool()
+
         except Exception as e:
             return validator.error(f"PDF extraction failed: {str(e)}")
 
-        # 2️ Preprocess text
-        preprocessor = TextPreprocessor(self.extracted_text)
-        preprocessor.run_pipeline()
-
-        self.cleaned_text = preprocessor.cleaned_text
-        self.warnings = preprocessor.warnings
+        cleaned_text, warnings = result
+        self.cleaned_text = cleaned_text
+        self.warnings = dict(warnings)
         validator.check_warnings(self.warnings)
 
-        # 3 LLM Inference
-        llm_controller = LLMController(
+        return None
+
+    async def _prepare_in_pool(self) -> tuple[str, dict]:
+        # 1️ Extract + 2️ preprocess: PyMuPDF and regex cleaning are
+        # CPU-bound, so they run on other cores, off the event loop
+        loop = asyncio.get_running_loop()
+        pool = get_process_pool()
+
+        try:
+            return await loop.run_in_executor(pool, prepare_text, self.source)
+        except BrokenProcessPool:
+            # A worker died: rebuild the pool and retry once
+            pool = reset_process_pool(pool)
+            return await loop.run_in_executor(pool, prepare_text, self.source)
+
+    def _build_llm_controller(self) -> LLMController:
+        return LLMController(
             text=self.cleaned_text,
             model=self.model,
             options=self.options,
@@ -75,7 +105,21 @@ class APIController:
             header_weights=self.header_weights
         )
 
-        llm_result = llm_controller.run_inference()
+    async def process(self) -> dict:
+        """
+        Executes the full summarization pipeline.
+        """
+
+        validator = ErrorValidator()
+
+        error = await self._prepare_text(validator)
+        if error:
+            return error
+
+        # 3 LLM Inference
+        llm_controller = self._build_llm_controller()
+
+        llm_result = await llm_controller.run_inference()
 
         if llm_result.get("status") == "error":
             return validator.error(llm_result.get("message"))
@@ -90,3 +134,26 @@ class APIController:
         self.response["language"] = self.language
 
         return self.response
+
+    async def process_stream(self) -> AsyncIterator[dict]:
+        """
+        Executes the pipeline, yielding summary chunks as the LLM
+        generates them and a final "done" (or "error") frame.
+        """
+
+        validator = ErrorValidator()
+
+        error = await self._prepare_text(validator)
+        if error:
+            yield {"type": "error", **error}
+            return
+
+        llm_controller = self._build_llm_controller()
+
+        async for frame in llm_controller.stream_inference():
+            if frame["type"] == "done":
+                self.summary = llm_controller.summary
+                frame["warnings"] = self.warnings
+                frame["language"] = self.language
+
+            yield frame
@@ -1,9 +1,50 @@
 import re
-from typing import List, Dict
+import threading
+from typing import List, Dict, Optional
+
+try:
+    import hyperscan
+except ImportError:  # optional: falls back to the stdlib combined regex
+    hyperscan = None
+
 from .pdf_extractor import PDFExtractor
 from .text_preprocessor import TextPreprocessor
 
 
+def _build_hyperscan_db(rules):
+    """
+    Compiles the classifier rules into a single Hyperscan database.
+    Pattern ids follow rule order, so the lowest matching id is the
+    alternative Python's regex would have picked.
+    """
+    if hyperscan is None:
+        return None
+
+    flags = (
+        hyperscan.HS_FLAG_CASELESS
+        | hyperscan.HS_FLAG_UTF8
+        | hyperscan.HS_FLAG_UCP
+        | hyperscan.HS_FLAG_SINGLEMATCH
+    )
+    expressions = [
+        (pattern if pattern.startswith("^") else f"^{pattern}").encode("utf-8")
+        for _, _, pattern in rules
+    ]
+
+    database = hyperscan.Database()
+    database.compile(
+        expressions=expressions,
+        ids=list(range(len(expressions))),
+        elements=len(expressions),
+        flags=[flags] * len(expressions),
+    )
+    return database
+
+
+def _collect_match(rule_id, start, end, flags, matched):
+    matched.append(rule_id)
+
+
 class PDFSectionExtractor:
     """
     Detects and structures academic sections from PDF-extracted text
@@ -103,44 +144,74 @@ class PDFSectionExtractor:
         re.IGNORECASE
     )
 
+    # =====================================================
+    # COMBINED CLASSIFIER
+    # =====================================================
+
+    # (group, label, pattern) in priority order: the first
+    # alternative that matches wins, as in an if/elif ladder.
+    # Captions are covered by the inline figure/table patterns.
+    CLASSIFY_RULES = (
+        ("references", "references", RE_REFERENCES.pattern),
+        ("figure", "noise", RE_FIGURE_INLINE.pattern),
+        ("table", "noise", RE_TABLE_INLINE.pattern),
+        ("equation", "noise", RE_EQUATION.pattern),
+        ("rq_header", "section", RE_RQ_HEADER.pattern),
+        ("url", "noise", rf".*?(?:{RE_URL.pattern})"),
+        ("abstract", "abstract", RE_ABSTRACT.pattern),
+        ("keywords", "keywords", RE_KEYWORDS.pattern),
+    )
+
+    RE_CLASSIFY = re.compile(
+        "|".join(f"(?P<{group}>{pattern})" for group, _, pattern in CLASSIFY_RULES),
+        re.IGNORECASE
+    )
+
+    LABEL_FOR_GROUP = {group: label for group, label, _ in CLASSIFY_RULES}
+
+    # Hyperscan matches every rule in one pass when available (about
+    # 2x faster per line than RE_CLASSIFY). Concurrent scans cannot
+    # share scratch space, so each thread allocates its own.
+    HS_DATABASE = _build_hyperscan_db(CLASSIFY_RULES)
+    _hs_local = threading.local()
+
     # =====================================================
     # SEMANTIC LISTS
     # =====================================================
 
-    NON_SECTION_KEYWORDS = {
+    NON_SECTION_KEYWORDS = frozenset({
         "figure", "fig", "table", "equation", "eq", "algorithm",
         "source", "note"
-    }
+    })
 
-    VALID_SECTION_STARTERS = {
+    VALID_SECTION_STARTERS = frozenset({
         "introduction", "background", "related", "method", "methods",
         "methodology", "experiment", "experiments", "results",
         "discussion", "conclusion", "future", "dataset", "data",
         "materials", "evaluation", "trabajo", "metodología",
         "resultados", "discusión", "conclusiones"
-    }
+    })
 
     # =====================================================
     # CONSTRUCTOR
     # =====================================================
 
-    def __init__(self, raw_text: str):
+    def __init__(self, raw_text: str, headers_only: bool = False):
         self.raw_text = raw_text
+        self.headers_only = headers_only
         self.lines = self._prepare_lines()
+        self.labels: Optional[List[str]] = None
         self.title = ""
         self.authors = ""
         self.sections: List[Dict] = []
+        self.headers: List[str] = []
 
     # =====================================================
     # NORMALIZATION
     # =====================================================
 
     def _prepare_lines(self) -> List[str]:
-        return [
-            line.strip()
-            for line in self.raw_text.splitlines()
-            if line.strip()
-        ]
+        return [line for line in map(str.strip, self.raw_text.splitlines()) if line]
 
     # =====================================================
     # HELPERS
@@ -151,51 +222,60 @@ class PDFSectionExtractor:
         return number.count(".") + 1
 
     def _looks_like_caption(self, line: str) -> bool:
-        words = line.lower().split()
-
-        if len(words) > 10:
+        # Cheapest test first; no allocation needed
+        if line.endswith("."):
             return True
 
-        if any(w in self.NON_SECTION_KEYWORDS for w in words):
-            return True
+        words = line.lower().split()
 
-        if line.endswith("."):
+        if len(words) > 10:
             return True
 
-        return False
+        return not self.NON_SECTION_KEYWORDS.isdisjoint(words)
 
     def _looks_like_section(self, line: str) -> bool:
-        first_word = line.lower().split()[0]
+        # Only the first word matters; avoid splitting the whole line
+        first_word = line.partition(" ")[0].lower()
         return first_word in self.VALID_SECTION_STARTERS
 
     # =====================================================
     # LINE CLASSIFICATION
     # =====================================================
 
-    def classify_line(self, line: str) -> str:
-        if self.RE_REFERENCES.match(line):
-            return "references"
-
-        if (
-            self.RE_FIGURE_CAPTION.match(line)
-            or self.RE_TABLE_CAPTION.match(line)
-            or self.RE_FIGURE_INLINE.match(line)
-            or self.RE_TABLE_INLINE.match(line)
-            or self.RE_EQUATION.match(line)
-        ):
-            return "noise"
-
-        if self.RE_RQ_HEADER.match(line):
-            return "section"
+    def _hs_scratch(self):
+        scratch = getattr(self._hs_local, "scratch", None)
+
+        if scratch is None:
+            scratch = self._hs_local.scratch = hyperscan.Scratch(self.HS_DATABASE)
 
-        if self.RE_URL.search(line):
-            return "noise"
+        return scratch
 
-        if self.RE_ABSTRACT.match(line):
-            return "abstract"
+    def _match_rules(self, line: str) -> Optional[str]:
+        if self.HS_DATABASE is not None:
+            try:
+                data = line.encode("utf-8")
+            except UnicodeEncodeError:
+                data = None  # lone surrogates: left to the re path
 
-        if self.RE_KEYWORDS.match(line):
-            return "keywords"
+            if data is not None:
+                matched = []
+
+                self.HS_DATABASE.scan(
+                    data,
+                    match_event_handler=_collect_match,
+                    context=matched,
+                    scratch=self._hs_scratch(),
+                )
+
+                return self.CLASSIFY_RULES[min(matched)][1] if matched else None
+
+        match = self.RE_CLASSIFY.match(line)
+        return self.LABEL_FOR_GROUP[match.lastgroup] if match else None
+
+    def classify_line(self, line: str) -> str:
+        label = self._match_rules(line)
+        if label:
+            return label
 
         if self.RE_SECTION_NUMBER_ONLY.match(line):
             return "section_number"
@@ -220,6 +300,23 @@ class PDFSectionExtractor:
 
         return "content"
 
+    def classify_lines(self) -> List[str]:
+        """
+        Labels lines once, up to References (nothing after it is used),
+        so title detection and section building share the same pass.
+        """
+        if self.labels is None:
+            self.labels = []
+
+            for line in self.lines:
+                label = self.classify_line(line)
+                self.labels.append(label)
+
+                if label == "references":
+                    break
+
+        return self.labels
+
     # =====================================================
     # TITLE & AUTHORS
     # =====================================================
@@ -228,8 +325,10 @@ class PDFSectionExtractor:
         title_lines = []
         authors = []
 
-        for line in self.lines[:scan_limit]:
-            label = self.classify_line(line)
+        labels = self.classify_lines()
+
+        for i, line in enumerate(self.lines[:scan_limit]):
+            label = labels[i] if i < len(labels) else self.classify_line(line)
 
             if label in {"abstract", "section"}:
                 break
@@ -246,6 +345,29 @@ class PDFSectionExtractor:
     # SECTION CONSTRUCTION
     # =====================================================
 
+    def build_headers(self) -> None:
+        """
+        Lightweight variant of build_sections that only collects
+        section headers (no content lists, preamble or subsections).
+        """
+        pending_section_number = None
+
+        for line, label in zip(self.lines, self.classify_lines()):
+
+            if label == "references":
+                break
+
+            if label == "section_number":
+                pending_section_number = line
+                continue
+
+            if label == "section":
+                self.headers.append(
+                    f"{pending_section_number} {line}"
+                    if pending_section_number else line
+                )
+                pending_section_number = None
+
     def build_sections(self) -> None:
         current = {
             "type": "preamble",
@@ -253,10 +375,10 @@ class PDFSectionExtractor:
             "content": []
         }
 
+        content = current["content"]
         pending_section_number = None
 
-        for line in self.lines:
-            label = self.classify_line(line)
+        for line, label in zip(self.lines, self.classify_lines()):
 
             if label == "references":
                 break
@@ -279,6 +401,7 @@ class PDFSectionExtractor:
                     "header": header,
                     "content": []
                 }
+                content = current["content"]
                 continue
 
             if label == "subsection":
@@ -288,12 +411,13 @@ class PDFSectionExtractor:
                     "header": line,
                     "content": []
                 }
+                content = current["content"]
                 continue
 
             if label == "noise":
                 continue
 
-            current["content"].append(line)
+            content.append(line)
 
         self.sections.append(current)
 
@@ -302,6 +426,10 @@ class PDFSectionExtractor:
     # =====================================================
 
     def process(self) -> Dict:
+        if self.headers_only:
+            self.build_headers()
+            return {"headers": self.headers}
+
         self.detect_title_and_authors()
         self.build_sections()
 
@@ -311,14 +439,14 @@ class PDFSectionExtractor:
             "sections": self.sections
         }
 
-    def extract_pdf_headers(self, pdf_path: str) -> List[str]:
+    def extract_pdf_headers(self, source: str | bytes) -> List[str]:
         """
         Full pipeline:
         PDF → text extraction → cleaning → section detection → header extraction
         """
 
         # 1) Extract raw text
-        extractor = PDFExtractor(pdf_path)
+        extractor = PDFExtractor(source)
         extracted_text = extractor.extract_text()
 
         if not extracted_text.strip():
@@ -329,10 +457,14 @@ class PDFSectionExtractor:
         preprocessor.run_pipeline()
         clean_text = preprocessor.cleaned_text
 
-        # 3) Section processing
-        extractor = PDFSectionExtractor(clean_text)
+        # 3) Section header detection; headers-only mode skips
+        # building the full section tree
+        extractor = PDFSectionExtractor(clean_text, headers_only=self.headers_only)
         document = extractor.process()
 
+        if self.headers_only:
+            return document["headers"]
+
         # 4) Return section headers only
         return [
             section["header"]
@@ -1,5 +1,6 @@
 from typing import Optional, Dict
-import json
+
+import orjson
 
 
 class JSONResponse:
@@ -26,8 +27,10 @@ class JSONResponse:
             "message": self.message
         }
 
-    def to_json(self) -> str:
+    def to_json(self, pretty: bool = False) -> str:
         """
-        Returns the response serialized as a JSON string.
+        Returns the response serialized as a JSON string
+        (indented only when pretty is set, e.g. for debugging).
         """
-        return json.dumps(self.to_dict(), ensure_ascii=False, indent=4)
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        return orjson.dumps(self.to_dict(), option=option).decode()
@@ -1,6 +1,152 @@
+import asyncio
+import threading
+import weakref
+from functools import lru_cache
+from typing import AsyncIterator
+
 import ollama
+from cachetools import TTLCache
 from langdetect import detect, LangDetectException
 
+from app.core.config import DEFAULT_MODEL, MAX_NUM_CTX
+
+try:
+    import gcld3  # optional: native CLD3 detector
+except ImportError:
+    gcld3 = None
+
+# Enough text for a reliable guess; longer input only costs time
+LANG_SAMPLE_CHARS = 1000
+
+# Streamed summaries are checked on their tail once generation ends
+LANG_TAIL_CHARS = 500
+
+_DETECTOR = (
+    gcld3.NNetLanguageIdentifier(min_num_bytes=0, max_num_bytes=4 * LANG_SAMPLE_CHARS)
+    if gcld3 is not None
+    else None
+)
+_DETECTOR_LOCK = threading.Lock()
+
+# One AsyncClient (and httpx connection pool) per event loop, reused
+# across requests: the API loop plus one loop per job worker thread.
+# A client's connections are bound to the loop that opened them.
+_clients = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+def _async_client() -> ollama.AsyncClient:
+    loop = asyncio.get_running_loop()
+
+    with _clients_lock:
+        client = _clients.get(loop)
+
+        if client is None:
+            client = _clients[loop] = ollama.AsyncClient()
+
+        return client
+
+# Installed models, refreshed lazily instead of on every request
+MODELS_CACHE_TTL = 30  # seconds
+
+_models_cache = TTLCache(maxsize=1, ttl=MODELS_CACHE_TTL)
+_models_lock = threading.Lock()
+
+
+def _cached_models() -> dict[str, str | None]:
+    """Maps installed model names to their quantization level."""
+    # Single refresh under the lock: concurrent misses wait for it
+    with _models_lock:
+        models = _models_cache.get("models")
+
+        if models is None:
+            response = ollama.list()
+            models = {
+                m.model: m.details.quantization_level if m.details else None
+                for m in response.models
+            }
+            _models_cache["models"] = models
+
+        return models
+
+# ----------------------------------
+# Prompt Templates
+# ----------------------------------
+
+LANGUAGE_NAMES = {
+    "spanish": "Spanish",
+    "english": "English",
+}
+
+TRANSLATION_PROMPT = (
+    "Translate the following text into {language_name} faithfully and accurately. "
+    "Do not summarize, rephrase, or add new information."
+)
+
+SUMMARY_PROMPT = (
+    "You are a scientific summarization model.\n"
+    "Generate an academic summary in {language_name}.\n\n"
+    "The summary must be clear, self-contained, and within approximately {max_tokens} tokens.\n\n"
+    "Mandatory rules:\n"
+    "- Third person\n"
+    "- No invented information\n"
+    "- No opinions\n"
+    "- Do not mention figures or tables\n\n"
+    "Integrate naturally:\n"
+    "- Research problem\n"
+    "- Methodology\n"
+    "- Main results\n"
+    "- Conclusions\n"
+    "{extra_instructions}\n"
+    "IMPORTANT: The final output must be only in {language_name}."
+)
+
+WEIGHTS_INSTRUCTIONS = (
+    "\nThe article contains user-prioritized sections.\n"
+    "Adjust the summary emphasis proportionally.\n"
+    "Do NOT explicitly list the headers in the final output.\n"
+    "{formatted_weights}\n"
+)
+
+
+@lru_cache(maxsize=64)
+def _format_header_weights(header_weights: tuple) -> str:
+    if not header_weights:
+        return ""
+
+    formatted = "\nSection priority weights:\n"
+
+    for header, percentage in header_weights:
+        formatted += f"- {header}: {round(percentage, 2)}% importance\n"
+
+    return formatted
+
+
+@lru_cache(maxsize=256)
+def _build_prompt(
+    language: str,
+    max_tokens: int,
+    translation: bool,
+    header_weights: tuple,
+) -> str:
+    language_name = LANGUAGE_NAMES[language]
+
+    if translation:
+        return TRANSLATION_PROMPT.format(language_name=language_name)
+
+    extra_instructions = ""
+
+    if header_weights:
+        extra_instructions = WEIGHTS_INSTRUCTIONS.format(
+            formatted_weights=_format_header_weights(header_weights)
+        )
+
+    return SUMMARY_PROMPT.format(
+        language_name=language_name,
+        max_tokens=max_tokens,
+        extra_instructions=extra_instructions,
+    )
+
 
 class LLMController:
     """
@@ -16,7 +162,7 @@ class LLMController:
     def __init__(
         self,
         text: str = "",
-        model: str = "llama3.2:3b",
+        model: str = DEFAULT_MODEL,
         options: dict | None = None,
         language: str = "spanish",
         header_weights: dict | None = None,
@@ -24,6 +170,10 @@ class LLMController:
         self.text = text
         self.model = model
         self.options = options or {}
+
+        # One num_ctx for every call (summary and translation) unless
+        # the caller sets it: a changed num_ctx forces a model reload
+        self.chat_options = {"num_ctx": MAX_NUM_CTX, **self.options}
         self.language = self._normalize_language(language)
         self.header_weights = header_weights or {}
         self.summary = ""
@@ -43,30 +193,13 @@ class LLMController:
         raise ValueError(f"Unsupported language: {language}")
     
 
-    # ----------------------------------
-    # Header Normalization
-    # ----------------------------------
-
-    def _format_header_weights(self) -> str:
-        if not self.header_weights:
-            return ""
-
-        formatted = "\nSection priority weights:\n"
-
-        for header, percentage in self.header_weights.items():
-            formatted += f"- {header}: {round(percentage, 2)}% importance\n"
-
-        return formatted
-
     # ----------------------------------
     # Model Validation
     # ----------------------------------
 
     def _validate_model(self) -> bool:
         try:
-            models = ollama.list()
-            available = [m.model for m in models.models]
-            return self.model in available
+            return self.model in _cached_models()
         except Exception:
             return False
 
@@ -75,94 +208,70 @@ class LLMController:
     # ----------------------------------
 
     def _build_prompt(self, max_tokens: int, translation: bool = False) -> str:
-
-        extra_instructions = ""
-
-        if self.header_weights:
-            formatted_weights = self._format_header_weights()
-
-            extra_instructions += (
-                "\nThe article contains user-prioritized sections.\n"
-                "Adjust the summary emphasis proportionally.\n"
-                "Do NOT explicitly list the headers in the final output.\n"
-                f"{formatted_weights}\n"
-            )
-
-        # Translation mode
-        if translation:
-            if self.language == "spanish":
-                return (
-                    "Translate the following text into Spanish faithfully and accurately. "
-                    "Do not summarize, rephrase, or add new information."
-                )
-            else:
-                return (
-                    "Translate the following text into English faithfully and accurately. "
-                    "Do not summarize, rephrase, or add new information."
-                )
-
-        # Summary generation
-        if self.language == "spanish":
-            return (
-                "You are a scientific summarization model.\n"
-                "Generate an academic summary in Spanish.\n\n"
-                f"The summary must be clear, self-contained, and within approximately {max_tokens} tokens.\n\n"
-                "Mandatory rules:\n"
-                "- Third person\n"
-                "- No invented information\n"
-                "- No opinions\n"
-                "- Do not mention figures or tables\n\n"
-                "Integrate naturally:\n"
-                "- Research problem\n"
-                "- Methodology\n"
-                "- Main results\n"
-                "- Conclusions\n"
-                f"{extra_instructions}\n"
-                "IMPORTANT: The final output must be only in Spanish."
-            )
-
-        else:
-            return (
-                "You are a scientific summarization model.\n"
-                "Generate an academic summary in English.\n\n"
-                f"The summary must be clear, self-contained, and within approximately {max_tokens} tokens.\n\n"
-                "Mandatory rules:\n"
-                "- Third person\n"
-                "- No invented information\n"
-                "- No opinions\n"
-                "- Do not mention figures or tables\n\n"
-                "Integrate naturally:\n"
-                "- Research problem\n"
-                "- Methodology\n"
-                "- Main results\n"
-                "- Conclusions\n"
-                f"{extra_instructions}\n"
-                "IMPORTANT: The final output must be only in English."
-            )
+        # Memoized on (language, max_tokens, translation, weights)
+        return _build_prompt(
+            self.language,
+            max_tokens,
+            translation,
+            tuple(self.header_weights.items()),
+        )
 
     # ----------------------------------
     # Ollama Interaction
     # ----------------------------------
 
-    def _run_chat(self, system_prompt: str, user_text: str) -> str:
-        response = ollama.chat(
+    async def _arun_chat(self, system_prompt: str, user_text: str) -> str:
+        response = await _async_client().chat(
             model=self.model,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_text},
             ],
-            options=self.options,
+            options=self.chat_options,
         )
 
         return response["message"]["content"]
 
+    async def _astream_chat(
+        self, system_prompt: str, user_text: str
+    ) -> AsyncIterator[str]:
+        stream = await _async_client().chat(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_text},
+            ],
+            options=self.chat_options,
+            stream=True,
+        )
+
+        async for part in stream:
+            yield part["message"]["content"]
+
+    # ----------------------------------
+    # Language Detection
+    # ----------------------------------
+
+    def _detect_language(self, text: str) -> str | None:
+        sample = text[:LANG_SAMPLE_CHARS]
+
+        if _DETECTOR is not None:
+            with _DETECTOR_LOCK:
+                language = _DETECTOR.FindLanguage(text=sample).language
+            return None if language == "und" else language
+
+        try:
+            return detect(sample)
+        except LangDetectException:
+            return None
+
     # ----------------------------------
     # Main Inference
     # ----------------------------------
 
-    def run_inference(self) -> dict:
+    async def run_inference(self) -> dict:
 
-        if not self._validate_model():
+        if not await asyncio.to_thread(self._validate_model):
             return {
                 "status": "error",
                 "message": f"Model '{self.model}' not available in Ollama.",
@@ -173,25 +282,24 @@ class LLMController:
 
             system_prompt = self._build_prompt(max_tokens)
 
-            self.summary = self._run_chat(system_prompt, self.text)
+            self.summary = await self._arun_chat(system_prompt, self.text)
 
-            # Language detection
-            try:
-                detected_lang = detect(self.summary)
-            except LangDetectException:
-                detected_lang = None
+            detected_lang = await asyncio.to_thread(
+                self._detect_language, self.summary
+            )
 
             expected_lang = self.SUPPORTED_LANGUAGES[self.language]
 
             if detected_lang != expected_lang:
 
-                translation_prompt = self._build_prompt(max_tokens, translation=True)
-                self.summary = self._run_chat(translation_prompt, self.summary)
+                # Memoized lookup: cheaper inline than a thread hand-off
+                translation_prompt = self._build_prompt(max_tokens, True)
+
+                self.summary = await self._arun_chat(translation_prompt, self.summary)
 
-                try:
-                    detected_lang = detect(self.summary)
-                except LangDetectException:
-                    detected_lang = None
+                detected_lang = await asyncio.to_thread(
+                    self._detect_language, self.summary
+                )
 
                 if detected_lang != expected_lang:
                     return {
@@ -211,16 +319,77 @@ class LLMController:
                 "message": f"LLM inference failed: {str(e)}",
             }
 
+    # ----------------------------------
+    # Streaming Inference
+    # ----------------------------------
+
+    async def stream_inference(self) -> AsyncIterator[dict]:
+        """
+        Yields {"type": "chunk"} frames while the summary is generated,
+        then a {"type": "done"} frame with the language check result.
+        Streamed text cannot be retranslated, so a mismatch is only
+        reported as a warning.
+        """
+
+        if not await asyncio.to_thread(self._validate_model):
+            yield {
+                "type": "error",
+                "status": "error",
+                "message": f"Model '{self.model}' not available in Ollama.",
+            }
+            return
+
+        try:
+            max_tokens = self.options.get("num_predict", 300)
+
+            system_prompt = self._build_prompt(max_tokens)
+
+            parts = []
+
+            async for content in self._astream_chat(system_prompt, self.text):
+                parts.append(content)
+                yield {"type": "chunk", "content": content}
+
+            self.summary = "".join(parts)
+
+            detected_lang = await asyncio.to_thread(
+                self._detect_language, self.summary[-LANG_TAIL_CHARS:]
+            )
+
+            expected_lang = self.SUPPORTED_LANGUAGES[self.language]
+
+            if detected_lang != expected_lang:
+                yield {
+                    "type": "done",
+                    "status": "warning",
+                    "message": f"Language mismatch. Expected {expected_lang}, detected {detected_lang}",
+                }
+                return
+
+            yield {"type": "done", "status": "success"}
+
+        except Exception as e:
+            yield {
+                "type": "error",
+                "status": "error",
+                "message": f"LLM inference failed: {str(e)}",
+            }
+
     # ----------------------------------
     # Utility
     # ----------------------------------
 
     def list_available_models(self) -> list | dict:
         try:
-            models = ollama.list()
-            return [m.model for m in models.models]
+            return list(_cached_models())
         except Exception as e:
             return {
                 "status": "error",
                 "message": f"Could not retrieve models: {str(e)}",
             }
+
+    def list_model_quantization(self) -> dict:
+        try:
+            return dict(_cached_models())
+        except Exception:
+            return {}
@@ -1,19 +1,206 @@
+import hashlib
+import io
+import math
+import os
+import tempfile
+import threading
+from bisect import bisect_right
+from concurrent.futures.process import BrokenProcessPool
+
 import fitz  # PyMuPDF
+from cachetools import LRUCache
+
+from app.core.config import TEMP_DIR, TEMP_FILE_PREFIX
+from app.core.process_pool import (
+    MAX_WORKERS,
+    get_process_pool,
+    in_worker_process,
+    reset_process_pool,
+)
+
+# Below this page count the process hand-off costs more than it saves
+PARALLEL_MIN_PAGES = 16
+
+# Minimal text extraction: no ligature/whitespace preservation, which the
+# regex-based cleaning downstream does not need; soft hyphens are joined.
+TEXT_FLAGS = fitz.TEXT_DEHYPHENATE | fitz.TEXT_MEDIABOX_CLIP
+
+# Extracted text keyed by content hash, so re-uploads skip parsing.
+# Bounded by total text length (characters), not by document count.
+TEXT_CACHE_SIZE = 32 * 1024 * 1024
+_text_cache = LRUCache(maxsize=TEXT_CACHE_SIZE, getsizeof=len)
+_text_cache_lock = threading.Lock()
+
+
+def content_digest(source: str | bytes | io.BytesIO) -> str:
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            digest = hashlib.file_digest(
+                f, lambda: hashlib.blake2b(digest_size=16)
+            )
+        return digest.hexdigest()
+
+    if isinstance(source, io.BytesIO):
+        with source.getbuffer() as view:
+            return hashlib.blake2b(view, digest_size=16).hexdigest()
+
+    return hashlib.blake2b(source, digest_size=16).hexdigest()
+
+
+def _open_document(source: str | bytes | io.BytesIO) -> fitz.Document:
+    if isinstance(source, str):
+        return fitz.open(source)
+    if isinstance(source, io.BytesIO):
+        return fitz.open(stream=source.getvalue(), filetype="pdf")
+    return fitz.open(stream=source, filetype="pdf")
+
+
+def _inside_table(
+    block: tuple,
+    table_tops: list[float],
+    table_rects: list[tuple],
+) -> bool:
+    x0, y0, x1, y1 = block
+
+    # Only tables starting above the block can contain it
+    candidates = table_rects[:bisect_right(table_tops, y0)]
+
+    return any(
+        tx0 <= x0 and x1 <= tx1 and y1 <= ty1
+        for tx0, _, tx1, ty1 in candidates
+    )
+
+
+def _extract_page(page: fitz.Page, exclude_tables: bool = True) -> str:
+    if exclude_tables:
+        table_rects = sorted(
+            (tuple(t.bbox) for t in page.find_tables()),
+            key=lambda rect: rect[1],
+        )
+        table_tops = [rect[1] for rect in table_rects]
+
+    # Same output as get_text("blocks") minus the dispatch and sorting
+    blocks = page.get_textpage(flags=TEXT_FLAGS).extractBLOCKS()
+    filtered_blocks = []
+
+    for x0, y0, x1, y1, text, _, block_type in blocks:
+        if block_type != 0 or not (text := text.strip()):
+            continue
+
+        if exclude_tables and table_rects and _inside_table(
+            (x0, y0, x1, y1), table_tops, table_rects
+        ):
+            continue
+
+        filtered_blocks.append(text)
+
+    return "\n".join(filtered_blocks).strip()
+
+
+def _stage_source(source: bytes | io.BytesIO) -> str:
+    """
+    Writes in-memory PDF bytes to a file in TEMP_DIR, so pool workers
+    get a path instead of a pickled copy of the whole document each.
+    """
+    fd, file_path = tempfile.mkstemp(
+        prefix=TEMP_FILE_PREFIX, suffix=".pdf", dir=TEMP_DIR
+    )
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if isinstance(source, io.BytesIO):
+                with source.getbuffer() as view:
+                    f.write(view)
+            else:
+                f.write(source)
+    except BaseException:
+        os.remove(file_path)
+        raise
+
+    return file_path
+
+
+def _extract_page_range(
+    file_path: str,
+    start: int,
+    stop: int,
+    exclude_tables: bool = True,
+) -> list[str]:
+    """
+    Worker entry point: every process opens its own document handle,
+    since PyMuPDF objects cannot be shared across threads or processes.
+    """
+    with _open_document(file_path) as doc:
+        return [
+            _extract_page(doc[i], exclude_tables)
+            for i in range(start, stop)
+        ]
+
 
 class PDFExtractor:
     """
     Responsible for extracting clean text from PDF files.
     """
 
-    def __init__(self, file_path: str):
-        self.file_path = file_path
+    def __init__(
+        self,
+        source: str | bytes | io.BytesIO,
+        exclude_tables: bool = True,
+    ):
+        self.source = source
+        self.exclude_tables = exclude_tables
 
     # ----------------------------------
     # Validation
     # ----------------------------------
 
     def _validate_extension(self) -> bool:
-        return self.file_path.lower().endswith(".pdf")
+        if not isinstance(self.source, str):
+            return True
+        return self.source.lower().endswith(".pdf")
+
+    def _describe(self) -> str:
+        if isinstance(self.source, str):
+            return f"file '{self.source}'"
+        return "uploaded file"
+
+    # ----------------------------------
+    # Page Extraction
+    # ----------------------------------
+
+    def _extract_parallel(self, page_count: int) -> list[str]:
+        staged_path = None
+        file_path = self.source
+
+        if not isinstance(file_path, str):
+            file_path = staged_path = _stage_source(self.source)
+
+        step = math.ceil(page_count / MAX_WORKERS)
+        starts = range(0, page_count, step)
+        stops = [min(start + step, page_count) for start in starts]
+
+        args = (
+            [file_path] * len(starts),
+            starts,
+            stops,
+            [self.exclude_tables] * len(starts),
+        )
+
+        try:
+            pool = get_process_pool()
+
+            try:
+                segments = list(pool.map(_extract_page_range, *args))
+            except BrokenProcessPool:
+                # A worker died: rebuild the pool and retry once
+                pool = reset_process_pool(pool)
+                segments = list(pool.map(_extract_page_range, *args))
+
+        finally:
+            if staged_path is not None:
+                os.remove(staged_path)
+
+        return [text for segment in segments for text in segment]
 
     # ----------------------------------
     # Public Method
@@ -22,56 +209,76 @@ class PDFExtractor:
     def extract_text(self) -> str:
         """
         Extracts textual content from a PDF file,
-        excluding text inside tables.
+        excluding text inside tables unless exclude_tables is False
+        (which also skips the costly table detection).
+
+        Results are cached by content hash in the API process; pool
+        workers skip the cache, which would only be duplicated per worker.
         """
 
         if not self._validate_extension():
             raise ValueError("Invalid file format. Only PDF files are allowed.")
 
+        if in_worker_process():
+            return self._extract()
+
         try:
-            with fitz.open(self.file_path) as doc:
+            cache_key = (content_digest(self.source), self.exclude_tables)
+        except OSError as e:
+            raise ValueError(
+                f"Could not open {self._describe()}. Error: {str(e)}"
+            )
 
-                all_pages_text = []
+        with _text_cache_lock:
+            cached = _text_cache.get(cache_key)
 
-                for page in doc:
+        if cached is not None:
+            return cached
 
-                    tables = page.find_tables()
-                    table_rects = [fitz.Rect(t.bbox) for t in tables]
+        final_text = self._extract()
 
-                    blocks = page.get_text("blocks")
-                    filtered_blocks = []
+        # Texts over the whole budget are not cached (LRUCache rejects them)
+        if len(final_text) <= TEXT_CACHE_SIZE:
+            with _text_cache_lock:
+                _text_cache[cache_key] = final_text
 
-                    for block in blocks:
-                        x0, y0, x1, y1, text, _, block_type = block
-                        block_rect = fitz.Rect(x0, y0, x1, y1)
+        return final_text
 
-                        inside_table = any(
-                            table_rect.contains(block_rect)
-                            for table_rect in table_rects
-                        )
+    def _extract(self) -> str:
+        try:
+            with _open_document(self.source) as doc:
+                page_count = doc.page_count
 
-                        if not inside_table and block_type == 0:
-                            filtered_blocks.append(text.strip())
+                parallel = (
+                    MAX_WORKERS > 1
+                    and page_count >= PARALLEL_MIN_PAGES
+                    and not in_worker_process()
+                )
 
-                    page_text = "\n".join(filtered_blocks).strip()
+                if not parallel:
+                    pages_text = [
+                        _extract_page(page, self.exclude_tables)
+                        for page in doc
+                    ]
 
-                    if page_text:
-                        all_pages_text.append(page_text)
+            if parallel:
+                pages_text = self._extract_parallel(page_count)
 
         except fitz.FileDataError:
             raise ValueError(
-                f"File '{self.file_path}' is corrupted or not a valid PDF."
+                f"The {self._describe()} is corrupted or not a valid PDF."
             )
         except Exception as e:
             raise ValueError(
-                f"Could not open file '{self.file_path}'. Error: {str(e)}"
+                f"Could not open {self._describe()}. Error: {str(e)}"
             )
 
+        all_pages_text = [text for text in pages_text if text]
         final_text = "\n".join(all_pages_text).strip()
 
         if not final_text:
             raise ValueError(
-                f"File '{self.file_path}' does not contain extractable text."
+                f"The {self._describe()} does not contain extractable text."
             )
 
         return final_text
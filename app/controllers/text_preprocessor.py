@@ -1,4 +1,56 @@
 import re
+from collections import Counter
+
+try:
+    import re2 as _re_engine  # linear-time matching (google-re2)
+except ImportError:
+    import re as _re_engine
+
+# ----------------------------------
+# Precompiled patterns
+# ----------------------------------
+
+# Margin-line normalization in one C pass: drop digits, lowercase ASCII
+_MARGIN_NORMALIZE = str.maketrans(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    "abcdefghijklmnopqrstuvwxyz",
+    "0123456789"
+)
+
+# Document-scale patterns run on re2 when installed. They avoid
+# backreferences and lookarounds, and use inline flags because
+# re2 does not take re's flag arguments.
+_RE_ABSTRACT = _re_engine.compile(r"(?i)\b(?:abstract|resumen)\b")
+_RE_INTRO = _re_engine.compile(r"(?i)\bintroduction\b")
+_RE_REFS = _re_engine.compile(r"(?i)\b(?:references|bibliography)\b")
+
+# Case-sensitive twins, run against a lowercased copy of the text
+_RE_ABSTRACT_LC = _re_engine.compile(r"\b(?:abstract|resumen)\b")
+_RE_INTRO_LC = _re_engine.compile(r"\bintroduction\b")
+_RE_REFS_LC = _re_engine.compile(r"\b(?:references|bibliography)\b")
+
+# Whitespace as re's \s matches it. re2's \s is ASCII-only and would
+# miss e.g. NBSP (U+00A0), common in extracted PDF text, so the class
+# is spelled out (as literal characters: re2 has no \u escape). \d and
+# \b are still ASCII-only under re2.
+_WS = r"\s" + "\x1c-\x1f\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000"
+
+_RE_EMAIL = _re_engine.compile(rf"[^{_WS}]+@[^{_WS}]+")
+_RE_IEEE = _re_engine.compile(r"\[\d+(?:[-,]\d+)*\]")
+# Commas only separate name groups, so the final ", YYYY" has a single
+# split point instead of every comma in the class being a candidate.
+_RE_APA = _re_engine.compile(
+    rf"\([A-Za-z{_WS}&]+(?:,[A-Za-z{_WS}&]+)*,[{_WS}]*\d{{4}}\)"
+)
+_RE_FIGTAB = _re_engine.compile(
+    rf"(?i)\b(?:figure|fig\.?|table|tab\.?|equation)[{_WS}]*\d*"
+)
+
+_RE_HYPHEN_BREAK = re.compile(r"-\s*\n")
+_RE_SOFT_BREAK = re.compile(r"\n(?=[a-z])")
+_RE_MULTI_BREAK = re.compile(r"\n{2,}")
+_RE_MULTI_SPACE = re.compile(r" {2,}")
+
 
 class TextPreprocessor:
     """
@@ -27,7 +79,9 @@ class TextPreprocessor:
         self._remove_sections()
         self._remove_inline_citations()
         self._rebuild_paragraphs()
-        self._normalize_case()
+
+        # Edges are trimmed once, after every step has run
+        self.cleaned_text = self.cleaned_text.strip()
 
     # ----------------------------------
     # Step 1 - Remove repeated margins
@@ -35,39 +89,37 @@ class TextPreprocessor:
 
     def _remove_margins(self) -> None:
 
-        lines = self.cleaned_text.split("\n")
-        frequency = {}
-
-        for line in lines:
-            stripped = line.strip()
-            if not stripped:
-                continue
-
-            normalized = re.sub(r"\d+", "", stripped)
-            normalized = re.sub(r"\s+", " ", normalized).lower()
-            frequency[normalized] = frequency.get(normalized, 0) + 1
-
-        filtered = []
+        # Only the normalized key of each line is kept (None for
+        # dropped lines); the lines themselves are re-split for the join
+        keys = []
+        frequency = Counter()
 
-        for line in lines:
+        # Single pass: drop page numbers, normalize once, count
+        for line in self.cleaned_text.splitlines():
             stripped = line.strip()
             if not stripped:
+                keys.append(None)
                 continue
 
-            if re.fullmatch(r"\d+", stripped):
+            if stripped.isdecimal():
                 self.warnings["page_numbers_removed"] = True
+                keys.append(None)
                 continue
 
-            normalized = re.sub(r"\d+", "", stripped)
-            normalized = re.sub(r"\s+", " ", normalized).lower()
+            normalized = " ".join(stripped.translate(_MARGIN_NORMALIZE).split())
+            if not normalized.isascii():
+                normalized = normalized.lower()
 
-            if frequency.get(normalized, 0) > 1:
-                self.warnings["repeated_headers_removed"] = True
-                continue
+            frequency[normalized] += 1
+            keys.append(normalized)
 
-            filtered.append(line)
+        if any(count > 1 for count in frequency.values()):
+            self.warnings["repeated_headers_removed"] = True
 
-        self.cleaned_text = "\n".join(filtered).strip()
+        self.cleaned_text = "\n".join(
+            line for line, key in zip(self.cleaned_text.splitlines(), keys)
+            if key is not None and frequency[key] == 1
+        )
 
     # ----------------------------------
     # Step 2 - Remove abstract & references
@@ -77,27 +129,43 @@ class TextPreprocessor:
 
         text = self.cleaned_text
 
+        # Fold case once so the searches below can use literal-prefix
+        # matching. Offsets only carry over if lowercasing kept the
+        # length (e.g. "İ" expands), otherwise search case-insensitively.
+        lowered = text.lower()
+
+        if len(lowered) == len(text):
+            haystack = lowered
+            re_abstract, re_intro, re_refs = (
+                _RE_ABSTRACT_LC, _RE_INTRO_LC, _RE_REFS_LC
+            )
+        else:
+            haystack = text
+            re_abstract, re_intro, re_refs = _RE_ABSTRACT, _RE_INTRO, _RE_REFS
+
         # Detect abstract
-        if re.search(r"\b(abstract|resumen)\b", text, re.IGNORECASE):
+        if re_abstract.search(haystack):
             self.warnings["abstract_detected"] = True
 
         # Trim everything before Introduction
-        intro_match = re.search(r"\bintroduction\b", text, re.IGNORECASE)
+        start = 0
+        intro_match = re_intro.search(haystack)
         if intro_match:
-            text = text[intro_match.start():]
+            start = intro_match.start()
 
-        # Remove references section
-        ref_match = re.search(
-            r"\b(references|bibliography)\b[\s\S]*$",
-            text,
-            re.IGNORECASE
-        )
+        # Remove references section (everything from the heading on)
+        end = len(text)
+        ref_match = re_refs.search(haystack, start)
 
         if ref_match:
-            text = text[:ref_match.start()]
+            end = ref_match.start()
             self.warnings["references_removed"] = True
 
-        self.cleaned_text = text.strip()
+        # The lowered copy is no longer needed: free it before slicing
+        del haystack, lowered
+
+        # Single slice, so only one trimmed copy is built
+        self.cleaned_text = text[start:end]
 
     # ----------------------------------
     # Step 3 - Remove citations & noise
@@ -105,26 +173,25 @@ class TextPreprocessor:
 
     def _remove_inline_citations(self) -> None:
 
-        text = self.cleaned_text
+        # Each pattern needs a literal character; a C-level "in"
+        # scan is much cheaper than a regex pass that finds nothing.
+        # Rebinding cleaned_text on every pass frees the previous
+        # buffer right away instead of at the end of the step.
 
         # Emails
-        text = re.sub(r"\S+@\S+", "", text)
+        if "@" in self.cleaned_text:
+            self.cleaned_text = _RE_EMAIL.sub("", self.cleaned_text)
 
         # IEEE style [1], [2-4]
-        text = re.sub(r"\[\d+(?:[-,]\d+)*\]", "", text)
+        if "[" in self.cleaned_text:
+            self.cleaned_text = _RE_IEEE.sub("", self.cleaned_text)
 
         # APA style (Author, 2020)
-        text = re.sub(r"\([A-Za-z\s,&]+,\s*\d{4}\)", "", text)
+        if "(" in self.cleaned_text:
+            self.cleaned_text = _RE_APA.sub("", self.cleaned_text)
 
         # Remove figure/table mentions
-        text = re.sub(
-            r"\b(figure|table|equation|fig\.?|tab\.?)\s*\d*",
-            "",
-            text,
-            flags=re.IGNORECASE,
-        )
-
-        self.cleaned_text = text.strip()
+        self.cleaned_text = _RE_FIGTAB.sub("", self.cleaned_text)
 
     # ----------------------------------
     # Step 4 - Rebuild paragraphs
@@ -132,25 +199,17 @@ class TextPreprocessor:
 
     def _rebuild_paragraphs(self) -> None:
 
-        text = self.cleaned_text
+        # Plain string replacements keep each pass in C; a callback
+        # per match costs more than the extra scans save
 
         # Fix hyphen line breaks
-        text = re.sub(r"-\s*\n", "", text)
+        self.cleaned_text = _RE_HYPHEN_BREAK.sub("", self.cleaned_text)
 
         # Join broken lines inside paragraphs
-        text = re.sub(r"\n(?=[a-z])", " ", text)
+        self.cleaned_text = _RE_SOFT_BREAK.sub(" ", self.cleaned_text)
 
         # Normalize multiple line breaks
-        text = re.sub(r"\n{2,}", "\n\n", text)
+        self.cleaned_text = _RE_MULTI_BREAK.sub("\n\n", self.cleaned_text)
 
         # Remove extra spaces
-        text = re.sub(r" {2,}", " ", text)
-
-        self.cleaned_text = text.strip()
-
-    # ----------------------------------
-    # Step 5 - Normalize case
-    # ----------------------------------
-
-    def _normalize_case(self) -> None:
-        self.cleaned_text = self.cleaned_text.lower()
+        self.cleaned_text = _RE_MULTI_SPACE.sub(" ", self.cleaned_text)
@@ -8,14 +8,38 @@ TEMP_DIR.mkdir(parents=True, exist_ok=True)
 
 load_dotenv()
 
+# RAM-backed staging for uploaded PDFs (falls back to TEMP_DIR)
+PDF_TMP_DIR = Path(os.getenv("PDF_TMPFS", "/dev/shm"))
+if not os.path.isdir(PDF_TMP_DIR):
+    PDF_TMP_DIR = TEMP_DIR
+
+TEMP_FILE_PREFIX = "yegi_"
+
+# Requests Ollama decodes together in one batch (continuous batching)
+OLLAMA_NUM_PARALLEL = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+
+# Pending /async jobs. Each keeps its PDF (up to 15MB) in PDF_TMP_DIR
+# while it waits, so this bounds how much of the tmpfs the queue holds
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "8"))
+
+# Q4_K_M quantization: ~2x decode throughput over FP16 for summaries
+DEFAULT_MODEL = os.getenv("OLLAMA_DEFAULT_MODEL", "llama3.2:3b-instruct-q4_K_M")
+
+# Context window (prompt + output) used for every request. Fixed: Ollama
+# reloads the runner and cannot batch requests whose num_ctx differs.
+# Ollama reserves KV cache for OLLAMA_NUM_PARALLEL x num_ctx tokens
+# (~110KB per token for Llama 3.2 3B), so the default stays modest
+MAX_NUM_CTX = int(os.getenv("OLLAMA_MAX_NUM_CTX", "4096"))
+
 class Settings:
     def __init__(self):
         self.FRONTEND_ORIGINS = self._get_origins()
         self.API_KEYS = self._get_api_keys()
 
     def _get_origins(self):
+        # frozenset: O(1) origin lookups in CORSMiddleware, deduplicated
         origins = os.getenv("FRONTEND_ORIGINS", "")
-        return [o.strip() for o in origins.split(",") if o.strip()]
+        return frozenset(o.strip() for o in origins.split(",") if o.strip())
 
     def _get_api_keys(self):
         return {
@@ -2,12 +2,18 @@ import uuid
 from queue import Queue
 import time
 
-job_queue = Queue()
+from app.core.config import JOB_QUEUE_SIZE
+
+job_queue = Queue(maxsize=JOB_QUEUE_SIZE)
 job_results = {}
 
 def create_job(data):
+    """
+    Queues a job and returns its id.
+    Raises queue.Full when JOB_QUEUE_SIZE jobs are already pending.
+    """
     job_id = str(uuid.uuid4())
-    job_queue.put((job_id, data))
+    job_queue.put_nowait((job_id, data))
     job_results[job_id] = {
         "status": "pending",
         "created_at": time.time()
@@ -0,0 +1,57 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# Set by the pool initializer, so only the pool's own workers see it.
+# parent_process() can't tell them apart: uvicorn --reload/--workers
+# also run the API process itself as a spawned child.
+_is_pool_worker = False
+
+def _mark_pool_worker() -> None:
+    global _is_pool_worker
+    _is_pool_worker = True
+
+def _create_pool() -> ProcessPoolExecutor:
+    # spawn: forking a process that already runs threads is unsafe
+    return ProcessPoolExecutor(
+        max_workers=MAX_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_mark_pool_worker,
+    )
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Returns the shared process pool for CPU-bound work,
+    creating it on first use.
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = _create_pool()
+
+        return _pool
+
+def reset_process_pool(broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+    """
+    Replaces the shared pool after a worker died abruptly
+    (BrokenProcessPool: MuPDF crash, OOM kill, ...), unless another
+    caller already replaced it. Returns the current pool.
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            _pool = _create_pool()
+
+        return _pool
+
+def in_worker_process() -> bool:
+    return _is_pool_worker
@@ -1,6 +1,6 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 
 from app.api.router import api_router
 from app.core.config import settings
@@ -14,10 +14,14 @@ import uuid
 setup_logging()
 logger = logging.getLogger("yegi.access")
 
+# Static 500 body, serialized once
+_ERR_BYTES = b'{"detail":"Internal server error"}'
+
 app = FastAPI(
     title="YEGI API",
     version="0.2.0",
-    redirect_slashes=False
+    redirect_slashes=False,
+    default_response_class=ORJSONResponse
 )
 
 
@@ -66,9 +70,10 @@ async def global_exception_handler(request: Request, exc: Exception):
     request_id = getattr(request.state, "request_id", "unknown")
     logger.error(f"[{request_id}] Unhandled exception: {str(exc)}")
 
-    return JSONResponse(
+    return Response(
+        content=_ERR_BYTES,
         status_code=500,
-        content={"detail": "Internal server error"}
+        media_type="application/json"
     )
 
 @app.get("/health")
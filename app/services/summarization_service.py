@@ -1,15 +1,51 @@
+import asyncio
+import copy
 import logging
+import threading
 import time
+from typing import AsyncIterator
+
+from cachetools import LRUCache
 
 from app.controllers.api_controller import APIController
+from app.controllers.pdf_extractor import content_digest
 
 logger = logging.getLogger("yegi.service")
 
+# Finished summaries keyed by document hash and generation settings,
+# bounded by total summary length (characters) rather than entry count
+SUMMARY_CACHE_SIZE = 4 * 1024 * 1024
+
+
+def _response_size(response: dict) -> int:
+    # At least 1, so empty summaries still count against the budget
+    return len(response.get("summary", "")) + 1
+
+
+_summary_cache = LRUCache(maxsize=SUMMARY_CACHE_SIZE, getsizeof=_response_size)
+_summary_cache_lock = threading.Lock()
+
+
+def _summary_key(
+    digest: str,
+    model: str,
+    options_dict: dict,
+    language: str,
+    header_weights: dict,
+) -> tuple:
+    return (
+        digest,
+        model,
+        language,
+        tuple(sorted(options_dict.items())),
+        tuple(sorted(header_weights.items())),
+    )
+
 
 class SummarizationService:
-    def summarize(
+    async def summarize(
         self,
-        file_path: str,
+        source: str | bytes,
         model: str,
         options_dict: dict,
         language: str,
@@ -22,14 +58,34 @@ class SummarizationService:
         )
 
         try:
+            digest = await asyncio.to_thread(content_digest, source)
+            cache_key = _summary_key(
+                digest, model, options_dict, language, header_weights
+            )
+
+            with _summary_cache_lock:
+                cached = _summary_cache.get(cache_key)
+
+            if cached is not None:
+                logger.info(
+                    f"[{request_id}] Summary served from cache | model={model}"
+                )
+                return copy.deepcopy(cached)
+
             controller = APIController(
-                file_path=file_path,
+                source=source,
                 model=model,
                 options=options_dict,
                 language=language,
                 header_weights=header_weights,
             )
-            respuesta = controller.process()
+            respuesta = await controller.process()
+
+            # Errors are not cached so the request can be retried
+            if respuesta.get("status") != "error":
+                with _summary_cache_lock:
+                    _summary_cache[cache_key] = copy.deepcopy(respuesta)
+
             duration = round(time.time() - start_time, 2)
             logger.info(
                 f"Summarization completed | model={model} | duration={duration}s"
@@ -41,4 +97,89 @@ class SummarizationService:
             logger.error(
                 f"Summarization failed | model={model} | duration={duration}s | error={str(e)}"
             )
-            raise
\ No newline at end of file
+            raise
+
+    async def summarize_batch(
+        self,
+        sources: list[str | bytes],
+        model: str,
+        options_dict: dict,
+        language: str,
+        header_weights: dict,
+        request_id: str = None,
+    ) -> list[dict]:
+        """
+        Summarizes several documents concurrently with shared settings.
+        Extraction and cleaning fan out over the process pool, and the
+        LLM calls are batched by Ollama (OLLAMA_NUM_PARALLEL).
+        A failing document yields an error entry instead of failing
+        the whole batch; results keep the order of sources.
+        """
+        logger.info(
+            f"[{request_id}] Start batch summarization | files={len(sources)} | model={model}"
+        )
+
+        results = await asyncio.gather(
+            *(
+                self.summarize(
+                    source=source,
+                    model=model,
+                    options_dict=options_dict,
+                    language=language,
+                    header_weights=header_weights,
+                    request_id=request_id,
+                )
+                for source in sources
+            ),
+            return_exceptions=True,
+        )
+
+        return [
+            {"status": "error", "message": "Internal server error"}
+            if isinstance(result, Exception)
+            else result
+            for result in results
+        ]
+
+    async def summarize_stream(
+        self,
+        source: str | bytes,
+        model: str,
+        options_dict: dict,
+        language: str,
+        header_weights: dict,
+        request_id: str = None,
+    ) -> AsyncIterator[dict]:
+        start_time = time.time()
+        logger.info(
+            f"[{request_id}] Start streamed summarization | model={model} | language={language}"
+        )
+
+        try:
+            controller = APIController(
+                source=source,
+                model=model,
+                options=options_dict,
+                language=language,
+                header_weights=header_weights,
+            )
+
+            async for frame in controller.process_stream():
+                yield frame
+
+            duration = round(time.time() - start_time, 2)
+            logger.info(
+                f"Streamed summarization completed | model={model} | duration={duration}s"
+            )
+
+        except Exception as e:
+            duration = round(time.time() - start_time, 2)
+            logger.error(
+                f"Streamed summarization failed | model={model} | duration={duration}s | error={str(e)}"
+            )
+            # Headers are already sent, so report the failure in-band
+            yield {
+                "type": "error",
+                "status": "error",
+                "message": "Internal server error",
+            }
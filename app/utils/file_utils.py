@@ -1,10 +1,78 @@
-import uuid
-from app.core.config import TEMP_DIR
+import os
+import tempfile
+from pathlib import Path
 
-def save_temp_file(file_content: bytes) -> str:
-    file_path = TEMP_DIR / f"{uuid.uuid4()}.pdf"
+import aiofiles
+from fastapi import HTTPException, UploadFile
 
-    with open(file_path, "wb") as f:
-        f.write(file_content)
+from app.core.config import PDF_TMP_DIR, TEMP_FILE_PREFIX
 
-    return str(file_path)
\ No newline at end of file
+CHUNK_SIZE = 1 << 20  # 1 MB
+STORAGE_FULL_DETAIL = "Not enough storage to accept the upload, try again later"
+
+async def save_upload_file(
+    upload_file: UploadFile,
+    max_size: int,
+    status_code: int = 413,
+    detail: str = "File too large",
+    directory: Path = PDF_TMP_DIR,
+) -> tuple[str, int]:
+    """
+    Streams an upload to a temporary PDF file in fixed-size chunks,
+    aborting as soon as max_size is exceeded.
+    A full staging directory is reported as 507 instead of a bare 500.
+    """
+    try:
+        fd, file_path = tempfile.mkstemp(
+            prefix=TEMP_FILE_PREFIX, suffix=".pdf", dir=directory
+        )
+        os.close(fd)
+    except OSError as e:
+        raise HTTPException(status_code=507, detail=STORAGE_FULL_DETAIL) from e
+
+    total = 0
+
+    try:
+        async with aiofiles.open(file_path, "wb") as f:
+            while chunk := await upload_file.read(CHUNK_SIZE):
+                total += len(chunk)
+
+                if total > max_size:
+                    raise HTTPException(status_code=status_code, detail=detail)
+
+                await f.write(chunk)
+
+    except OSError as e:
+        os.remove(file_path)
+        raise HTTPException(status_code=507, detail=STORAGE_FULL_DETAIL) from e
+
+    except BaseException:
+        os.remove(file_path)
+        raise
+
+    return file_path, total
+
+async def read_upload_file(
+    upload_file: UploadFile,
+    max_size: int,
+    status_code: int = 413,
+    detail: str = "File too large",
+) -> bytes:
+    """
+    Reads an upload into memory with a single read, so the result
+    is the only copy of the file. The size is checked beforehand when
+    the multipart parser recorded it, otherwise the read is bounded
+    one byte past max_size to tell an oversized upload apart.
+    """
+    if upload_file.size is not None:
+        if upload_file.size > max_size:
+            raise HTTPException(status_code=status_code, detail=detail)
+
+        return await upload_file.read()
+
+    content = await upload_file.read(max_size + 1)
+
+    if len(content) > max_size:
+        raise HTTPException(status_code=status_code, detail=detail)
+
+    return content
@@ -1,3 +1,4 @@
+import asyncio
 import threading
 import os
 import time
@@ -7,8 +8,7 @@ from pathlib import Path
 
 from app.services.summarization_service import SummarizationService
 from app.core.job_queue import job_queue, job_results, cleanup_jobs
-from app.core.config import TEMP_DIR
-from app.utils.file_utils import save_temp_file
+from app.core.config import OLLAMA_NUM_PARALLEL, PDF_TMP_DIR, TEMP_DIR, TEMP_FILE_PREFIX
 
 
 logger = logging.getLogger("yegi.worker")
@@ -21,17 +21,24 @@ def worker():
 def cleanup_temp_files(ttl=3600):
     now = time.time()
 
-    for file in Path(TEMP_DIR).glob("*.pdf"):
-        if now - file.stat().st_mtime > ttl:
-            try:
-                file.unlink()
-            except:
-                pass
+    # Batch uploads are staged in TEMP_DIR, the rest in PDF_TMP_DIR
+    for directory in {Path(PDF_TMP_DIR), Path(TEMP_DIR)}:
+        for file in directory.glob(f"{TEMP_FILE_PREFIX}*.pdf"):
+            if now - file.stat().st_mtime > ttl:
+                try:
+                    file.unlink()
+                except:
+                    pass
 
 def worker():
     global last_cleanup
     service = SummarizationService()
 
+    # One long-lived loop per thread (not asyncio.run per job), so the
+    # Ollama client and its keep-alive connections are reused
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
     while True:
         job_id, data = job_queue.get()
 
@@ -43,7 +50,7 @@ def worker():
         logger.info(f"Processing job {job_id}")
 
         try:
-            result = service.summarize(**data)
+            result = loop.run_until_complete(service.summarize(**data))
 
             job_results[job_id].update({
                 "status": "completed",
@@ -62,8 +69,8 @@ def worker():
 
         finally:
             try:
-                if os.path.exists(data["file_path"]):
-                    os.remove(data["file_path"])
+                if os.path.exists(data["source"]):
+                    os.remove(data["source"])
             except Exception as e:
                 print(f"Error deleting temp file: {e}")
 
@@ -76,5 +83,6 @@ def worker():
                 last_cleanup = now
 
 
-for _ in range(3):
+# One worker per Ollama batch slot, so queued jobs are decoded together
+for _ in range(OLLAMA_NUM_PARALLEL):
     threading.Thread(target=worker, daemon=True).start()
\ No newline at end of file